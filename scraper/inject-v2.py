@@ -7,70 +7,212 @@ Targeted injection of real Plein Droit titles, formations, and homepage content.
 
 import json
 import re
-import hashlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from html import escape
-from bs4 import BeautifulSoup
+
+import diskcache
+from selectolax.lexbor import LexborHTMLParser
 
 BASE_DIR = Path(__file__).parent.parent
 CONTENT_DIR = BASE_DIR / "content"
 CACHE_DIR = Path(__file__).parent / ".cache"
 
+# Patterns are compiled once at import rather than on every injector call.
+_PLEIN_DROIT_NUM_RE = re.compile(r'Plein Droit<br>n°\d+')
+_LATEST_ISSUE_YEAR_RE = re.compile(r'(Dernier numéro — )[^<]+')
+_LATEST_ISSUE_TITLE_RE = re.compile(
+    r'(<h3 class="h4 mt-sm" style="color:var\(--color-primary-dark\)">)[^<]+(</h3>)')
+_PUB_DETAIL_TITLE_RE = re.compile(r'(<h1[^>]*class="pub-detail__title"[^>]*>)[^<]+(</h1>)')
+_PUB_DETAIL_NUM_RE = re.compile(r'(Plein Droit n°)\d+')
+
+# Catalogue pages scraped alongside the real formations
+STOP_TITLES = frozenset({"inscription individuelle", "formations intra-structures",
+                         "catalogue des formations du gisti"})
+
+# Formation fields, cleaned and HTML-escaped, shared by the index and formations pages
+Formation = namedtuple("Formation", "title desc fmt price duration date day month")
+
+# Card templates, filled with %-formatting from already-escaped values
+FEATURED_CARD_FMT = '''          <article class="card">
+            <div class="card__body">
+              <span class="card__overline">%s</span>
+              <h3 class="card__title">
+                <a href="article.html">%s</a>
+              </h3>
+              <div class="card__meta">
+                <span>gisti.org</span>
+              </div>
+            </div>
+          </article>'''
+
+FORMATION_MINI_FMT = '''              <div class="formation-mini">
+                <div class="formation-mini__date">
+                  <span class="formation-mini__date-day">%s</span>
+                  <span class="formation-mini__date-month">%s</span>
+                </div>
+                <div>
+                  <p class="formation-mini__title">%s</p>
+                  <p class="formation-mini__meta">%s</p>
+                </div>
+              </div>'''
+
+PLEIN_DROIT_CARD_FMT = '''          <a href="publication-detail.html" class="pub-card" data-filter-item data-type="plein-droit" data-year="2025">
+            <div class="pub-card__cover-placeholder">Plein Droit<br>n&deg;%d</div>
+            <div class="pub-card__body">
+              <span class="pub-card__type">Plein Droit</span>
+              <h3 class="pub-card__title">%s</h3>
+              <span class="pub-card__meta">n&deg;%d</span>
+              <span class="pub-card__price">6 &euro;</span>
+            </div>
+          </a>'''
+
+FORMATION_CARD_FMT = '''          <div class="formation-card" data-filter-item>
+            <div class="formation-card__header">
+              <h3 class="formation-card__title">%s</h3>
+              <span class="formation-card__format %s">%s</span>
+            </div>
+            <p class="formation-card__desc">%s</p>
+            <div class="formation-card__details">
+              %s
+              <span class="formation-card__places">Places disponibles</span>
+            </div>
+          </div>'''
+
+
+# Card fields repeat a lot (formats, types, dates, empty strings), so the
+# escaped and cleaned forms are memoised.
+_escape = lru_cache(maxsize=2048)(escape)
+
 
 def load_json(path):
     try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
+        # One sized read; json decodes the UTF-8 bytes itself
+        return json.loads(Path(path).read_bytes())
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 
+@lru_cache(maxsize=None)
+def _page_cache():
+    # The scraper's DiskCache store: url -> (status, headers, html, fetched_at);
+    # html is None for failures
+    return diskcache.Cache(str(CACHE_DIR))
+
+
 def load_cached(url):
-    h = hashlib.md5(url.encode()).hexdigest()
-    f = CACHE_DIR / f"{h}.html"
-    if f.exists():
-        return BeautifulSoup(f.read_text(encoding="utf-8"), "lxml")
+    # Opening the store would create it; without a scraper run there is nothing to read
+    if not CACHE_DIR.exists():
+        return None
+    entry = _page_cache().get(url)
+    if entry is not None and entry[0] == 200:
+        return LexborHTMLParser(entry[2])
     return None
 
 
+@lru_cache(maxsize=2048)
 def clean(text):
-    if not text:
-        return ""
-    return re.sub(r'\s+', ' ', text).strip()
+    return ' '.join(text.split()) if text else ""
+
+
+def replace_slot(html, name, content):
+    """Replace what sits between the <!-- INJECT:name --> markers of a template.
+
+    Returns html unchanged if the markers are missing.
+    """
+    start_marker = f"<!-- INJECT:{name} -->"
+    start = html.find(start_marker)
+    if start == -1:
+        return html
+    start += len(start_marker)
+    end = html.find(f"<!-- /INJECT:{name} -->", start)
+    if end == -1:
+        return html
+    # Keep the closing marker's own line (and indentation) intact; a marker
+    # on the opening one's line (an empty slot) gets a line of its own
+    line_start = html.rfind("\n", start, end)
+    tail = html[line_start:] if line_start != -1 else "\n" + html[end:]
+    return f"{html[:start]}\n{content}{tail}"
+
+
+class HtmlEditor:
+    """Keeps edited pages in memory and writes each changed one once on exit.
+
+    Usage:
+        with HtmlEditor() as editor:
+            html = editor.get(path)
+            editor.set(path, new_html)
+    """
+
+    def __init__(self):
+        self.docs = {}
+        self.dirty = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def get(self, path):
+        if path not in self.docs:
+            self.docs[path] = path.read_text(encoding="utf-8")
+        return self.docs[path]
+
+    def set(self, path, html):
+        if html != self.get(path):
+            self.docs[path] = html
+            self.dirty.add(path)
 
+    def flush(self):
+        for path in self.dirty:
+            path.write_text(self.docs[path], encoding="utf-8")
+        self.dirty.clear()
 
+
+@lru_cache(maxsize=None)
 def get_plein_droit_issues():
-    """Extract all Plein Droit issues from rubrique38."""
-    soup = load_cached("https://www.gisti.org/spip.php?rubrique38")
-    if not soup:
-        return []
+    """Extract all Plein Droit issues from rubrique38.
+
+    Cached for the run; returns a tuple so callers can't alter the shared result.
+    """
+    tree = load_cached("https://www.gisti.org/spip.php?rubrique38")
+    if tree is None:
+        return ()
 
     issues = []
-    for h2 in soup.select("h2"):
-        title = clean(h2.get_text())
+    for h2 in tree.css("h2"):
+        title = clean(h2.text())
         if title and len(title) > 3:
-            link = h2.find("a")
-            href = link.get("href", "") if link else ""
+            link = h2.css_first("a")
+            href = (link.attributes.get("href") or "") if link is not None else ""
             issues.append({
                 "title": title,
                 "url": f"https://www.gisti.org/{href}" if href else "",
             })
-    return issues
+    return tuple(issues)
 
 
+@lru_cache(maxsize=None)
 def get_homepage_articles():
-    """Extract featured articles from the homepage."""
-    soup = load_cached("https://www.gisti.org")
-    if not soup:
-        return []
+    """Extract featured articles from the homepage.
+
+    Cached for the run; returns a tuple so callers can't alter the shared result.
+    """
+    tree = load_cached("https://www.gisti.org")
+    if tree is None:
+        return ()
 
     articles = []
     seen = set()
 
     # Look for article links in the main content area
-    for link in soup.select("a[href*='article']"):
-        title = clean(link.get_text())
-        href = link.get("href", "")
+    for link in tree.css("a[href*='article']"):
+        title = clean(link.text())
+        href = link.attributes.get("href") or ""
 
         if (title and len(title) > 15 and title not in seen
                 and "article" in href
@@ -78,80 +220,93 @@ def get_homepage_articles():
             seen.add(title)
             articles.append({"title": title, "url": href})
 
-    return articles
+    return tuple(articles)
+
+
+def normalize_formation(formation):
+    """Clean and escape a formation's fields once for all templates."""
+    date = clean(formation.get("date", ""))
+
+    day, month = "", ""
+    if date:
+        parts = date.split()
+        if len(parts) >= 2:
+            day = parts[0]
+            month = parts[1][:4] + "."
+
+    return Formation(
+        title=_escape(clean(formation.get("title", ""))),
+        desc=_escape(clean(formation.get("description", "Formation professionnelle continue par le GISTI."))[:200]),
+        fmt=formation.get("format", "presentiel"),
+        price=_escape(clean(formation.get("price", ""))),
+        duration=_escape(clean(formation.get("duration", ""))),
+        date=_escape(date),
+        day=_escape(day),
+        month=_escape(month),
+    )
+
+
+def good_formations(formations_json):
+    """Keep the scraped entries that are actual formations, as raw dicts."""
+    return tuple(f for f in formations_json
+                 if f.get("title")
+                 and len(f["title"]) > 10
+                 and f["title"].lower() not in STOP_TITLES
+                 and not f["title"].startswith("20"))  # skip date-only entries
 
 
-def get_formations():
-    """Extract formations with details."""
-    formations_json = load_json(CONTENT_DIR / "formations" / "all.json")
-    # Filter meaningful ones
-    return [f for f in formations_json
-            if f.get("title")
-            and len(f["title"]) > 10
-            and f["title"].lower() not in ["inscription individuelle", "formations intra-structures",
-                                            "catalogue des formations du gisti"]
-            and not f["title"].startswith("20")]
+def get_formations(formations):
+    """Normalize already-filtered formations for the templates."""
+    return [normalize_formation(f) for f in formations]
 
 
 # --- Injection functions ---
 
-def inject_index():
-    """Inject real content into index.html."""
+def inject_index(editor, formations, articles, homepage):
+    """Inject real content into index.html.
+
+    This is the only injector for index.html; inject-content.py calls it too.
+    Featured articles come from the cached homepage, falling back to the
+    scraped articles and then to homepage.json.
+    """
     print("\n[1] index.html")
     path = BASE_DIR / "index.html"
-    html = path.read_text(encoding="utf-8")
+    html = editor.get(path)
 
     # Get data
     homepage_articles = get_homepage_articles()
-    formations = get_formations()
     plein_droit = get_plein_droit_issues()
 
+    if not homepage_articles:
+        homepage_articles = list(islice(({"title": clean(a["title"]), "url": a.get("url", "")}
+                                         for a in articles if len(a.get("title", "")) > 10), 3))
+    if not homepage_articles and isinstance(homepage, dict):
+        homepage_articles = [{"title": clean(a["title"]), "url": a["url"]}
+                             for a in homepage.get("featured_articles", [])[:3]]
+
     # --- Featured articles ---
     if homepage_articles:
         featured = homepage_articles[:3]
         cards = []
         types = ["Analyse", "Communiqué", "Action"]
         for i, a in enumerate(featured):
-            title = escape(a["title"])
+            title = _escape(a["title"])
             overline = types[i % 3]
-            cards.append(f'''          <article class="card">
-            <div class="card__body">
-              <span class="card__overline">{overline}</span>
-              <h3 class="card__title">
-                <a href="article.html">{title}</a>
-              </h3>
-              <div class="card__meta">
-                <span>gisti.org</span>
-              </div>
-            </div>
-          </article>''')
+            cards.append(FEATURED_CARD_FMT % (overline, title))
 
         cards_html = "\n\n".join(cards)
-        pattern = r'(class="grid grid-3 reveal">\s*\n)(.*?)(</div>\s*</div>\s*</section>\s*\n\s*<!-- Dossiers actifs)'
-        html = re.sub(pattern, rf'\1{cards_html}\n\3', html, flags=re.DOTALL)
+        html = replace_slot(html, "featured", cards_html)
         print(f"  Articles: injected {len(featured)} featured articles")
 
     # --- Plein Droit latest ---
     if plein_droit:
         latest = plein_droit[0]
-        title = escape(latest["title"])
+        title = _escape(latest["title"])
         # Numbering: 138 issues, latest = 140 (approx)
         num = 140
-        html = re.sub(
-            r'Plein Droit<br>n°\d+',
-            f'Plein Droit<br>n&deg;{num}',
-            html
-        )
-        html = re.sub(
-            r'(Dernier numéro — )[^<]+',
-            r'\g<1>2025',
-            html
-        )
-        html = re.sub(
-            r'(<h3 class="h4 mt-sm" style="color:var\(--color-primary-dark\)">)[^<]+(</h3>)',
-            rf'\1{title}\2',
-            html
-        )
+        html = _PLEIN_DROIT_NUM_RE.sub(f'Plein Droit<br>n&deg;{num}', html)
+        html = _LATEST_ISSUE_YEAR_RE.sub(r'\g<1>2025', html)
+        html = _LATEST_ISSUE_TITLE_RE.sub(rf'\1{title}\2', html)
         print(f"  Plein Droit: {title}")
 
     # --- Formations ---
@@ -159,17 +314,7 @@ def inject_index():
         real_f = formations[:4]
         f_cards = []
         for f in real_f:
-            title = escape(clean(f.get("title", "")))
-            date = clean(f.get("date", ""))
-            price = escape(clean(f.get("price", "")))
-            duration = escape(clean(f.get("duration", "")))
-
-            day, month = "?", ""
-            if date:
-                parts = date.split()
-                if len(parts) >= 2:
-                    day = parts[0]
-                    month = parts[1][:4] + "."
+            title, price, duration = f.title, f.price, f.duration
 
             meta_parts = []
             if duration:
@@ -178,26 +323,16 @@ def inject_index():
             if price:
                 meta_parts.append(price)
 
-            f_cards.append(f'''              <div class="formation-mini">
-                <div class="formation-mini__date">
-                  <span class="formation-mini__date-day">{escape(day)}</span>
-                  <span class="formation-mini__date-month">{escape(month)}</span>
-                </div>
-                <div>
-                  <p class="formation-mini__title">{title}</p>
-                  <p class="formation-mini__meta">{" &middot; ".join(meta_parts)}</p>
-                </div>
-              </div>''')
+            f_cards.append(FORMATION_MINI_FMT % (f.day or "?", f.month, title, " &middot; ".join(meta_parts)))
 
         f_html = "\n\n".join(f_cards)
-        pattern = r'(class="flex flex-col gap-sm">\s*\n)(.*?)(</div>\s*</div>\s*</div>\s*</div>\s*</section>\s*\n\s*<!-- CTA Soutenir)'
-        html = re.sub(pattern, rf'\1{f_html}\n\3', html, flags=re.DOTALL)
+        html = replace_slot(html, "formations", f_html)
         print(f"  Formations: injected {len(real_f)}")
 
-    path.write_text(html, encoding="utf-8")
+    editor.set(path, html)
 
 
-def inject_publications():
+def inject_publications(editor):
     """Inject Plein Droit issues into publications.html."""
     print("\n[2] publications.html")
     path = BASE_DIR / "publications.html"
@@ -205,40 +340,31 @@ def inject_publications():
         print("  -> not found")
         return
 
-    html = path.read_text(encoding="utf-8")
     issues = get_plein_droit_issues()
-
     if not issues:
         print("  -> no Plein Droit data")
         return
 
+    html = editor.get(path)
+
     # Generate publication cards
     cards = []
     for i, issue in enumerate(issues[:12]):
-        title = escape(issue["title"])
+        title = _escape(issue["title"])
         num = 140 - i
-        cards.append(f'''          <a href="publication-detail.html" class="pub-card" data-filter-item data-type="plein-droit" data-year="2025">
-            <div class="pub-card__cover-placeholder">Plein Droit<br>n&deg;{num}</div>
-            <div class="pub-card__body">
-              <span class="pub-card__type">Plein Droit</span>
-              <h3 class="pub-card__title">{title}</h3>
-              <span class="pub-card__meta">n&deg;{num}</span>
-              <span class="pub-card__price">6 &euro;</span>
-            </div>
-          </a>''')
+        cards.append(PLEIN_DROIT_CARD_FMT % (num, title, num))
 
     cards_html = "\n\n".join(cards)
-    pattern = r'(data-filter-container[^>]*>\s*\n)(.*?)(</div>\s*\n\s*<!-- Pagination)'
-    new_html = re.sub(pattern, rf'\1{cards_html}\n\3', html, flags=re.DOTALL)
+    new_html = replace_slot(html, "publications", cards_html)
 
     if new_html != html:
-        path.write_text(new_html, encoding="utf-8")
+        editor.set(path, new_html)
         print(f"  -> Injected {len(cards)} Plein Droit issues")
     else:
         print("  -> Pattern not matched")
 
 
-def inject_publication_detail():
+def inject_publication_detail(editor):
     """Inject latest Plein Droit into publication-detail.html."""
     print("\n[3] publication-detail.html")
     path = BASE_DIR / "publication-detail.html"
@@ -246,26 +372,19 @@ def inject_publication_detail():
         print("  -> not found")
         return
 
-    html = path.read_text(encoding="utf-8")
     issues = get_plein_droit_issues()
+    if not issues:
+        return
+
+    html = editor.get(path)
+    title = _escape(issues[0]["title"])
+    html = _PUB_DETAIL_TITLE_RE.sub(rf'\g<1>{title}\2', html)
+    html = _PUB_DETAIL_NUM_RE.sub(r'\g<1>140', html)
+    editor.set(path, html)
+    print(f"  -> Updated with: {title}")
 
-    if issues:
-        title = escape(issues[0]["title"])
-        html = re.sub(
-            r'(<h1[^>]*class="pub-detail__title"[^>]*>)[^<]+(</h1>)',
-            rf'\g<1>{title}\2',
-            html
-        )
-        html = re.sub(
-            r'(Plein Droit n°)\d+',
-            r'\g<1>140',
-            html
-        )
-        path.write_text(html, encoding="utf-8")
-        print(f"  -> Updated with: {title}")
-
-
-def inject_formations():
+
+def inject_formations(editor, formations):
     """Inject real formations into formations.html."""
     print("\n[4] formations.html")
     path = BASE_DIR / "formations.html"
@@ -273,22 +392,17 @@ def inject_formations():
         print("  -> not found")
         return
 
-    html = path.read_text(encoding="utf-8")
-    formations = get_formations()
-
     if not formations:
         print("  -> no formations data")
         return
 
+    html = editor.get(path)
+
     # Generate formation cards
     cards = []
     for f in formations[:6]:
-        title = escape(clean(f.get("title", "")))
-        desc = escape(clean(f.get("description", "Formation professionnelle continue par le GISTI."))[:200])
-        fmt = f.get("format", "presentiel")
-        price = escape(clean(f.get("price", "")))
-        duration = escape(clean(f.get("duration", "")))
-        date = escape(clean(f.get("date", "")))
+        title, desc, fmt = f.title, f.desc, f.fmt
+        price, duration, date = f.price, f.duration, f.date
 
         fmt_label = {"presentiel": "Présentiel", "distanciel": "Distanciel"}.get(fmt, "Présentiel")
         fmt_class = f"formation-card__format--{fmt}"
@@ -304,39 +418,20 @@ def inject_formations():
         if price:
             details.append(f'<span class="formation-card__detail formation-card__price">{price}</span>')
 
-        cards.append(f'''          <div class="formation-card" data-filter-item>
-            <div class="formation-card__header">
-              <h3 class="formation-card__title">{title}</h3>
-              <span class="formation-card__format {fmt_class}">{fmt_label}</span>
-            </div>
-            <p class="formation-card__desc">{desc}</p>
-            <div class="formation-card__details">
-              {chr(10).join("              " + d for d in details)}
-              <span class="formation-card__places">Places disponibles</span>
-            </div>
-          </div>''')
+        cards.append(FORMATION_CARD_FMT % (
+            title, fmt_class, fmt_label, desc,
+            "\n".join("              " + d for d in details)))
 
     cards_html = "\n\n".join(cards)
-
-    # Try to find the grid container for formation cards
-    # Look for the section after the filter bar
-    pattern = r'(class="grid-auto"[^>]*data-filter-container[^>]*>\s*\n)(.*?)(</div>\s*\n\s*</div>\s*\n\s*</section>)'
-    new_html = re.sub(pattern, rf'\1{cards_html}\n\3', html, flags=re.DOTALL, count=1)
+    new_html = replace_slot(html, "formations", cards_html)
 
     if new_html != html:
-        path.write_text(new_html, encoding="utf-8")
+        editor.set(path, new_html)
         print(f"  -> Injected {len(cards)} formations")
     else:
-        # Try alternate pattern
-        pattern2 = r'(data-filter-container[^>]*>\s*\n)(.*?)(</div>\s*\n\s*</section>)'
-        new_html = re.sub(pattern2, rf'\1{cards_html}\n\3', html, flags=re.DOTALL, count=1)
-        if new_html != html:
-            path.write_text(new_html, encoding="utf-8")
-            print(f"  -> Injected {len(cards)} formations (alt pattern)")
-        else:
-            print("  -> Pattern not matched, writing card titles for reference:")
-            for f in formations[:6]:
-                print(f"     - {f['title']}")
+        print("  -> Pattern not matched, writing card titles for reference:")
+        for f in formations[:6]:
+            print(f"     - {f.title}")
 
 
 def main():
@@ -344,10 +439,25 @@ def main():
     print("Content Injection v2")
     print("=" * 60)
 
-    inject_index()
-    inject_publications()
-    inject_publication_detail()
-    inject_formations()
+    formations = get_formations(good_formations(load_json(CONTENT_DIR / "formations" / "all.json")))
+    articles = load_json(CONTENT_DIR / "articles" / "all.json")
+    homepage = load_json(CONTENT_DIR / "homepage.json")
+    # Warm the cached page lookups here; lru_cache does not stop concurrent
+    # misses from pool threads parsing the same page again.
+    get_plein_droit_issues()
+    get_homepage_articles()
+
+    # Every injector edits a different page, so they can run side by side;
+    # the pool is joined before the editor writes the pages out.
+    with HtmlEditor() as editor, ThreadPoolExecutor(max_workers=4) as pool:
+        jobs = [
+            pool.submit(inject_index, editor, formations, articles, homepage),
+            pool.submit(inject_publications, editor),
+            pool.submit(inject_publication_detail, editor),
+            pool.submit(inject_formations, editor, formations),
+        ]
+        for job in jobs:
+            job.result()
 
     print("\n" + "=" * 60)
     print("DONE")
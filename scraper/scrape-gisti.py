@@ -3,7 +3,10 @@
 GISTI Website Scraper v2
 ========================
 Scrapes content from gisti.org for the redesign prototype.
-Rate-limited (1 request per 2 seconds) with local cache.
+Rate-limited (1 request per 2 seconds on average, token bucket) with a local
+DiskCache (SQLite) page cache; pages older than a day are revalidated with
+conditional GETs (ETag/Last-Modified).
+Pages are fetched concurrently with aiohttp.
 Better URL targeting for the current GISTI site structure.
 
 Usage:
@@ -13,89 +16,315 @@ Usage:
 Output: JSON files in ../content/
 """
 
+import asyncio
 import json
 import os
 import time
-import hashlib
 import re
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import diskcache
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json writes the same files
+    orjson = None
 
 # --- Configuration ---
 BASE_URL = "https://www.gisti.org"
 CACHE_DIR = Path(__file__).parent / ".cache"
 OUTPUT_DIR = Path(__file__).parent.parent / "content"
-RATE_LIMIT = 2  # seconds between requests
+RATE_LIMIT = 2  # seconds between requests, on average
+BURST = 4  # requests that may go out back to back after an idle spell
+MAX_IN_FLIGHT = 8  # concurrent requests, independent of the rate above
+MAX_RETRIES = 3  # on 429/5xx, dropped connections and timeouts
+RETRY_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 USER_AGENT = "GISTI-Redesign-Scraper/2.0 (educational prototype)"
 TIMEOUT = 45
+CACHE_SIZE_LIMIT = 2 ** 30  # bytes, least recently used pages are evicted first
+REVALIDATE_AFTER = 86400  # seconds before a cached page is checked again (ETag/Last-Modified)
+MISSING_TTL = 3600  # seconds a 4xx page is remembered as missing
+ERROR_TTL = 300  # seconds a network error or exhausted 5xx/429 retries are remembered
+
+# Created in main(), inside the event loop
+session = None
+bucket = None
+in_flight = None  # asyncio.Semaphore(MAX_IN_FLIGHT)
+cache = None  # url -> (status, headers, html, fetched_at); html is None for failures
+_fetches = {}  # url -> task, so concurrent scrapers share one download
+_trees = {}  # url -> parsed page (or None), so shared entry pages are parsed once
+
+# Compiled once at import; clean_text alone runs on every extracted node.
+_WS_RE = re.compile(r'\s+')
+# Formation date, price and duration, found in one left-to-right scan. The
+# year is a lookahead so the scan resumes on it ("12 mars 2026 jours" also
+# holds a duration, as it did with three separate searches).
+_FORMATION_RE = re.compile(
+    r'(?P<date>\d{1,2}\s+(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+)(?=(?P<year>\d{4}))'
+    r'|(?P<price>\d+\s*€)'
+    r'|(?P<duration>\d+\s*jour)',
+    re.IGNORECASE)
+_COUNT_RE = re.compile(r'\((\d+)\)')
+
+# Selectors tried in order; the first match wins
+_ARTICLE_TITLE_SELECTORS = ("h1.titre", ".titre-article", "h1.entry-title", "#contenu h1", "h1")
+_ARTICLE_BODY_SELECTORS = (".texte", ".article-texte", ".entry-content", "#contenu .texte")
+_ARTICLE_DATE_SELECTORS = (".date", ".date-publication", "time", ".post-date")
+_ARTICLE_RUBRIQUE_SELECTORS = (".rubrique a", ".fil-ariane a", "nav.breadcrumb a")
+_ARTICLE_FIELD_SELECTORS = {
+    "title": _ARTICLE_TITLE_SELECTORS,
+    "body": _ARTICLE_BODY_SELECTORS,
+    "date": _ARTICLE_DATE_SELECTORS,
+    "rubrique": _ARTICLE_RUBRIQUE_SELECTORS,
+}
+_ALL_LINKS = "a[href]"
+_ARTICLE_LINKS = "a[href*='article']"
+_RUBRIQUE_LINKS = "a[href*='rubrique']"
+
+
+class TokenBucket:
+    """Rate limiter: `rate` requests per second on average, bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in request order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def fetch(url):
+    task = _fetches.get(url)
+    if task is None:
+        task = _fetches[url] = asyncio.ensure_future(_fetch(url))
+    return await task
+
+
+async def _fetch(url):
+    entry = cache.get(url)
+    if entry is not None and entry[2] is None:
+        # Failed recently; the entry expires after MISSING_TTL / ERROR_TTL
+        print(f"  [cache] {url} (failed: {entry[0] or 'network error'})")
+        return None
+    if entry is not None and time.time() - entry[3] < REVALIDATE_AFTER:
+        print(f"  [cache] {url}")
+        return entry[2]
 
-session = requests.Session()
-session.headers.update({"User-Agent": USER_AGENT})
-last_request_time = 0
+    # Stale entry: ask the server whether the page changed since
+    headers = {}
+    if entry is not None:
+        if "ETag" in entry[1]:
+            headers["If-None-Match"] = entry[1]["ETag"]
+        if "Last-Modified" in entry[1]:
+            headers["If-Modified-Since"] = entry[1]["Last-Modified"]
 
+    try:
+        status, validators, html = await _get(url, headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        status = getattr(e, "status", 0)  # set on HTTP errors (ClientResponseError)
+        missing = 400 <= status < 500 and status != 429
+        # A stale copy covers transient failures, not a page that is gone
+        if entry is not None and not missing:
+            print(f"  [error] {url}: {str(e) or type(e).__name__} (using cached copy)")
+            return entry[2]
+        print(f"  [error] {url}: {str(e) or type(e).__name__}")
+        cache.set(url, (status, {}, None, time.time()),
+                  expire=MISSING_TTL if missing else ERROR_TTL)
+        return None
 
-def get_cache_path(url):
-    url_hash = hashlib.md5(url.encode()).hexdigest()
-    return CACHE_DIR / f"{url_hash}.html"
+    if status == 304:
+        cache.set(url, entry[:3] + (time.time(),))
+        print(f"  [304] {url}")
+        return entry[2]
+    cache.set(url, (status, validators, html, time.time()))
+    print(f"  [fetch] {url}")
+    return html
+
+
+async def _get(url, headers):
+    """GET url -> (status, validators, html), retrying transient failures with backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            async with in_flight:
+                await bucket.acquire()
+                async with session.get(url, headers=headers) as response:
+                    if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                        continue
+                    response.raise_for_status()
+                    validators = {k: response.headers[k] for k in ("ETag", "Last-Modified")
+                                  if k in response.headers}
+                    html = None if response.status == 304 else await response.text(errors="replace")
+                    return response.status, validators, html
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
 
 
-def fetch(url):
-    global last_request_time
-    cache_path = get_cache_path(url)
-    if cache_path.exists():
-        print(f"  [cache] {url}")
-        return cache_path.read_text(encoding="utf-8")
+def parse(html):
+    return LexborHTMLParser(html)
 
-    elapsed = time.time() - last_request_time
-    if elapsed < RATE_LIMIT:
-        time.sleep(RATE_LIMIT - elapsed)
 
-    try:
-        response = session.get(url, timeout=TIMEOUT)
-        response.raise_for_status()
-        last_request_time = time.time()
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        cache_path.write_text(response.text, encoding="utf-8")
-        print(f"  [fetch] {url}")
-        return response.text
-    except requests.RequestException as e:
-        print(f"  [error] {url}: {e}")
-        return None
+async def fetch_tree(url):
+    """Parsed page at url, or None; parsed once per run however many scrapers ask."""
+    if url not in _trees:
+        html = await fetch(url)
+        if url not in _trees:  # another scraper may have parsed it meanwhile
+            _trees[url] = parse(html) if html else None
+    return _trees[url]
 
 
-def parse(html):
-    return BeautifulSoup(html, "lxml")
+def select_article_fields(tree):
+    """Each article field's first match, trying its selectors in priority order."""
+    return {
+        field: next((el for el in map(tree.css_first, selectors) if el is not None), None)
+        for field, selectors in _ARTICLE_FIELD_SELECTORS.items()
+    }
+
+
+def truncated_text(el, limit):
+    """clean_text(el.text())[:limit], without extracting more of a long element than needed."""
+    pieces = []
+    visible = 0  # non-whitespace characters so far, all of which survive clean_text
+    for node in el.traverse(include_text=True):
+        if node.is_text_node:
+            text = node.text_content
+            pieces.append(text)
+            visible += len(text) - sum(map(len, _WS_RE.findall(text)))
+            if visible >= limit:
+                break
+    return clean_text("".join(pieces))[:limit]
+
+
+def select(tree, selector):
+    """tree.css(selector) with each node once, in document order.
+
+    Lexbor yields a node once per selector of a comma list that it matches.
+    Nodes are told apart by mem_id: node equality compares markup, which
+    would merge distinct but identical links.
+    """
+    seen = set()
+    for node in tree.css(selector):
+        if node.mem_id not in seen:
+            seen.add(node.mem_id)
+            yield node
+
+
+def iter_hrefs(tree, selector):
+    """href of each anchor matching `selector` that has a non-empty one."""
+    for link in select(tree, selector):
+        href = link.attrs.get("href")
+        if href:
+            yield href
+
+
+def iter_links(tree, selector):
+    """(href, cleaned text) of each anchor matching `selector` that has a non-empty href."""
+    for link in select(tree, selector):
+        href = link.attrs.get("href")
+        if href:
+            yield href, clean_text(link.text())
+
+
+def find_next_text(node, pattern):
+    """First text after `node` in document order (its own text included) matching `pattern`."""
+    while node is not None:
+        if node.child is not None:
+            node = node.child
+        else:
+            while node is not None and node.next is None:
+                node = node.parent
+            if node is None:
+                return None
+            node = node.next
+        if node.is_text_node and pattern.search(node.text_content):
+            return node.text_content
+    return None
 
 
 def save_json(data, filepath):
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Write next to the target and rename over it, so an interrupted run
+    # never leaves a half-written file for the site to read
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, filepath)
     print(f"  -> Saved {filepath} ({len(data)} items)")
 
 
 def clean_text(text):
     """Clean scraped text: collapse whitespace, strip."""
-    if not text:
-        return ""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return _WS_RE.sub(' ', text).strip() if text else ""
+
+
+@lru_cache(maxsize=8192)
+def _join(href):
+    """urljoin(BASE_URL, href), memoised: the same hrefs come back on every page."""
+    if href.startswith(("http://", "https://")):
+        return href
+    return urljoin(BASE_URL, href)
 
 
 # --- Scrapers ---
 
-def scrape_homepage():
+async def harvest(entry_urls, selector, keep, seen=None):
+    """Links matching `selector` on the entry pages -> [(full_url, href, title)], in page order.
+
+    Each URL is kept once, the first time keep(href, title) accepts it;
+    pass the same `seen` set to share that across calls.
+    """
+    seen = set() if seen is None else seen
+    links = []
+    for tree in await asyncio.gather(*(fetch_tree(url) for url in entry_urls)):
+        if tree is None:
+            continue
+        # Inlined iter_links: repeated URLs (nav, footers) are dropped before
+        # their text is extracted and cleaned, which is most of the per-link cost
+        for link in select(tree, selector):
+            href = link.attrs.get("href")
+            if not href:
+                continue
+            full_url = _join(href)
+            if full_url in seen:
+                continue
+            title = clean_text(link.text())
+            if keep(href, title):
+                seen.add(full_url)
+                links.append((full_url, href, title))
+    return links
+
+
+async def scrape_homepage():
     """Scrape the homepage for main content and navigation links."""
     print("\n[1/7] Scraping homepage...")
-    html = fetch(BASE_URL)
-    if not html:
+    tree = await fetch_tree(BASE_URL)
+    if tree is None:
         return {}
 
-    soup = parse(html)
     data = {
         "title": "",
         "tagline": "",
@@ -104,37 +333,34 @@ def scrape_homepage():
     }
 
     # Get main title/tagline
-    title_el = soup.select_one("h1, .site-title, #logo")
+    title_el = tree.css_first("h1, .site-title, #logo")
     if title_el:
-        data["title"] = clean_text(title_el.get_text())
+        data["title"] = clean_text(title_el.text())
 
     # Get featured/latest content from homepage
-    for link in soup.select("#contenu a, .une a, .articles a, main a"):
-        href = link.get("href", "")
-        title = clean_text(link.get_text())
+    seen_featured = set()
+    for href, title in iter_links(tree, "#contenu a, .une a, .articles a, main a"):
         if title and len(title) > 5 and "article" in href:
-            full_url = urljoin(BASE_URL, href)
-            if full_url not in [a["url"] for a in data["featured_articles"]]:
+            full_url = _join(href)
+            if full_url not in seen_featured:
+                seen_featured.add(full_url)
                 data["featured_articles"].append({
                     "url": full_url,
                     "title": title[:200],
                 })
 
     # Get nav links
-    for link in soup.select("nav a, .menu a, #nav a"):
-        href = link.get("href", "")
-        title = clean_text(link.get_text())
+    for href, title in iter_links(tree, "nav a, .menu a, #nav a"):
         if title and href:
             data["navigation_links"].append({
-                "url": urljoin(BASE_URL, href),
+                "url": _join(href),
                 "title": title,
             })
 
-    save_json(data, OUTPUT_DIR / "homepage.json")
     return data
 
 
-def scrape_articles():
+async def scrape_articles():
     """Scrape articles from multiple entry points."""
     print("\n[2/7] Scraping articles...")
     articles = []
@@ -148,84 +374,64 @@ def scrape_articles():
         f"{BASE_URL}/",                       # Homepage
     ]
 
-    for page_url in entry_pages:
-        html = fetch(page_url)
-        if not html:
+    article_urls = []
+    pages = await asyncio.gather(*(fetch_tree(url) for url in entry_pages))
+    for tree in pages:
+        if tree is None:
             continue
 
-        soup = parse(html)
-        article_urls = []
+        section_urls = []
 
-        for link in soup.select("a[href*='article']"):
-            href = link.get("href", "")
+        for href in iter_hrefs(tree, _ARTICLE_LINKS):
             if "article" in href and href not in seen_urls:
-                full_url = urljoin(BASE_URL, href)
+                full_url = _join(href)
                 if full_url not in seen_urls:
-                    article_urls.append(full_url)
+                    section_urls.append(full_url)
                     seen_urls.add(full_url)
 
         # Scrape up to 8 articles per section
-        for url in article_urls[:8]:
-            article = scrape_single_article(url)
-            if article and article["title"] != "Sans titre":
-                articles.append(article)
-
-    # Deduplicate
-    unique = {}
-    for a in articles:
-        if a["url"] not in unique:
-            unique[a["url"]] = a
-    articles = list(unique.values())
-
-    save_json(articles, OUTPUT_DIR / "articles" / "all.json")
+        article_urls.extend(section_urls[:8])
+
+    for article in await asyncio.gather(*(scrape_single_article(url) for url in article_urls)):
+        if article and article["title"] != "Sans titre":
+            articles.append(article)
+
     return articles
 
 
-def scrape_single_article(url):
-    html = fetch(url)
-    if not html:
+async def scrape_single_article(url):
+    tree = await fetch_tree(url)
+    if tree is None:
         return None
 
-    soup = parse(html)
-
     # Try multiple selectors for SPIP pages
-    title = ""
-    for sel in ["h1.titre", ".titre-article", "h1.entry-title", "#contenu h1", "h1"]:
-        el = soup.select_one(sel)
-        if el:
-            title = clean_text(el.get_text())
-            break
+    fields = select_article_fields(tree)
+
+    el = fields["title"]
+    title = clean_text(el.text()) if el else ""
 
     body = ""
     body_html = ""
-    for sel in [".texte", ".article-texte", ".entry-content", "#contenu .texte"]:
-        el = soup.select_one(sel)
-        if el:
-            body_html = str(el)
-            body = clean_text(el.get_text())[:1000]
-            break
-
-    date = ""
-    for sel in [".date", ".date-publication", "time", ".post-date"]:
-        el = soup.select_one(sel)
-        if el:
-            date = clean_text(el.get_text())
-            break
+    el = fields["body"]
+    if el:
+        body_html = el.html
+        body = truncated_text(el, 1000)
+
+    el = fields["date"]
+    date = clean_text(el.text()) if el else ""
 
     # Extract keywords/mots-cles
     keywords = []
-    for kw in soup.select(".mots-cles a, .tags a, .mot-cle a, .groupe-mots a"):
-        kw_text = clean_text(kw.get_text())
-        if kw_text and kw_text not in keywords:
+    seen_keywords = set()
+    for kw in select(tree, ".mots-cles a, .tags a, .mot-cle a, .groupe-mots a"):
+        kw_text = clean_text(kw.text())
+        if kw_text and kw_text not in seen_keywords:
+            seen_keywords.add(kw_text)
             keywords.append(kw_text)
 
     # Extract rubrique/section
-    rubrique = ""
-    for sel in [".rubrique a", ".fil-ariane a", "nav.breadcrumb a"]:
-        el = soup.select_one(sel)
-        if el:
-            rubrique = clean_text(el.get_text())
-            break
+    el = fields["rubrique"]
+    rubrique = clean_text(el.text()) if el else ""
 
     if not title:
         return None
@@ -241,12 +447,9 @@ def scrape_single_article(url):
     }
 
 
-def scrape_dossiers():
+async def scrape_dossiers():
     """Scrape dossier/rubrique structure."""
     print("\n[3/7] Scraping dossiers...")
-    dossiers = []
-    seen = set()
-
     # The GISTI site organizes by years under rubrique77
     # Let's also try to find thematic rubriques
     entry_urls = [
@@ -254,51 +457,25 @@ def scrape_dossiers():
         f"{BASE_URL}/spip.php?rubrique3",
         f"{BASE_URL}/",
     ]
+    dossiers = [
+        {"url": url, "title": title}
+        for url, _, title in await harvest(
+            entry_urls, _RUBRIQUE_LINKS,
+            lambda href, title: len(title) >= 3 and "#" not in href)
+    ]
 
-    for entry_url in entry_urls:
-        html = fetch(entry_url)
-        if not html:
-            continue
-
-        soup = parse(html)
-
-        for link in soup.select("a[href*='rubrique']"):
-            href = link.get("href", "")
-            title = clean_text(link.get_text())
-            if not title or len(title) < 3 or "#" in href:
-                continue
-
-            full_url = urljoin(BASE_URL, href)
-            if full_url in seen:
-                continue
-            seen.add(full_url)
-
-            dossiers.append({
-                "url": full_url,
-                "title": title,
-            })
-
-    # Deduplicate by URL and enrich with article counts
-    unique = {}
-    for d in dossiers:
-        if d["url"] not in unique and d["title"] not in ["", " "]:
-            unique[d["url"]] = d
-
+    # Enrich with article counts (harvest already dropped duplicate URLs)
+    selected = dossiers[:19]
     enriched = []
-    for url, d in list(unique.items())[:19]:
-        html = fetch(url)
+    for d, tree in zip(selected, await asyncio.gather(*(fetch_tree(d["url"]) for d in selected))):
         article_count = 0
         description = ""
-        if html:
-            soup = parse(html)
-            article_count = len(set(
-                urljoin(BASE_URL, a.get("href", ""))
-                for a in soup.select("a[href*='article']")
-            ))
+        if tree is not None:
+            article_count = len(set(map(_join, iter_hrefs(tree, _ARTICLE_LINKS))))
             # Try to get description
-            desc_el = soup.select_one(".texte p, .descriptif, .description")
+            desc_el = tree.css_first(".texte p, .descriptif, .description")
             if desc_el:
-                description = clean_text(desc_el.get_text())[:300]
+                description = truncated_text(desc_el, 300)
 
         enriched.append({
             "url": d["url"],
@@ -307,232 +484,184 @@ def scrape_dossiers():
             "description": description,
         })
 
-    save_json(enriched, OUTPUT_DIR / "dossiers" / "all.json")
     return enriched
 
 
-def scrape_publications():
+async def scrape_publications():
     """Scrape the publications catalog (Plein Droit, notes, cahiers)."""
     print("\n[4/7] Scraping publications...")
     publications = []
-    seen = set()
+    seen = set()  # shared, so each URL is listed under the first section it appears in
+    plein_droit_url = f"{BASE_URL}/spip.php?rubrique38"
+    notes_url = f"{BASE_URL}/spip.php?rubrique47"
+    general_url = f"{BASE_URL}/spip.php?rubrique19"
+
+    # Start all three downloads; the harvests below then wait on them in section order
+    await asyncio.gather(fetch(plein_droit_url), fetch(notes_url), fetch(general_url))
 
     # Plein Droit listing
-    html = fetch(f"{BASE_URL}/spip.php?rubrique38")
-    if html:
-        soup = parse(html)
-        for link in soup.select("a"):
-            href = link.get("href", "")
-            title = clean_text(link.get_text())
-            full_url = urljoin(BASE_URL, href)
-
-            if title and len(title) > 3 and full_url not in seen:
-                pub_type = "Plein Droit" if "plein" in title.lower() or "rubrique38" in href else "Publication"
-                seen.add(full_url)
-                publications.append({
-                    "url": full_url,
-                    "title": title,
-                    "type": pub_type,
-                })
+    for url, href, title in await harvest([plein_droit_url], _ALL_LINKS,
+                                          lambda href, title: len(title) > 3, seen):
+        pub_type = "Plein Droit" if "plein" in title.lower() or "rubrique38" in href else "Publication"
+        publications.append({"url": url, "title": title, "type": pub_type})
 
     # Notes pratiques
-    html = fetch(f"{BASE_URL}/spip.php?rubrique47")
-    if html:
-        soup = parse(html)
-        for link in soup.select("a[href*='article']"):
-            href = link.get("href", "")
-            title = clean_text(link.get_text())
-            full_url = urljoin(BASE_URL, href)
-
-            if title and len(title) > 5 and full_url not in seen:
-                seen.add(full_url)
-                publications.append({
-                    "url": full_url,
-                    "title": title,
-                    "type": "Note pratique",
-                })
+    for url, _, title in await harvest([notes_url], _ARTICLE_LINKS,
+                                       lambda href, title: len(title) > 5, seen):
+        publications.append({"url": url, "title": title, "type": "Note pratique"})
 
     # Also try general publications
-    html = fetch(f"{BASE_URL}/spip.php?rubrique19")
-    if html:
-        soup = parse(html)
-        for link in soup.select("a[href*='article']"):
-            href = link.get("href", "")
-            title = clean_text(link.get_text())
-            full_url = urljoin(BASE_URL, href)
-
-            if title and len(title) > 5 and full_url not in seen:
-                seen.add(full_url)
-                publications.append({
-                    "url": full_url,
-                    "title": title,
-                    "type": "Publication",
-                })
+    for url, _, title in await harvest([general_url], _ARTICLE_LINKS,
+                                       lambda href, title: len(title) > 5, seen):
+        publications.append({"url": url, "title": title, "type": "Publication"})
 
-    save_json(publications, OUTPUT_DIR / "publications" / "all.json")
     return publications
 
 
-def scrape_formations():
+async def scrape_formations():
     """Scrape the formations catalog."""
     print("\n[5/7] Scraping formations...")
     formations = []
-    seen = set()
 
     # Try the main formations page
-    for url in [f"{BASE_URL}/formations", f"{BASE_URL}/spip.php?rubrique20",
-                f"{BASE_URL}/spip.php?page=formations"]:
-        html = fetch(url)
-        if not html:
-            continue
-
-        soup = parse(html)
-
-        for link in soup.select("a"):
-            href = link.get("href", "")
-            title = clean_text(link.get_text())
-            full_url = urljoin(BASE_URL, href)
-
-            # Filter to article links with meaningful titles
-            if ("article" in href and title and len(title) > 10
-                    and full_url not in seen
-                    and not title.startswith("20")):  # skip date-only entries
-                seen.add(full_url)
-
-                # Try to detect format
-                fmt = "presentiel"
-                title_lower = title.lower()
-                if "webinaire" in title_lower or "distanciel" in title_lower or "en ligne" in title_lower:
-                    fmt = "distanciel"
-
-                formations.append({
-                    "url": full_url,
-                    "title": title,
-                    "format": fmt,
-                })
+    entry_urls = [f"{BASE_URL}/formations", f"{BASE_URL}/spip.php?rubrique20",
+                  f"{BASE_URL}/spip.php?page=formations"]
+    # Filter to article links with meaningful titles, skipping date-only entries
+    links = await harvest(entry_urls, _ALL_LINKS,
+                          lambda href, title: ("article" in href and len(title) > 10
+                                               and not title.startswith("20")))
+    for url, _, title in links:
+        # Try to detect format
+        fmt = "presentiel"
+        title_lower = title.lower()
+        if "webinaire" in title_lower or "distanciel" in title_lower or "en ligne" in title_lower:
+            fmt = "distanciel"
+
+        formations.append({
+            "url": url,
+            "title": title,
+            "format": fmt,
+        })
 
     # Enrich first few with detail scraping
-    for i, f in enumerate(formations[:13]):
-        html = fetch(f["url"])
-        if html:
-            soup = parse(html)
-            text_el = soup.select_one(".texte, .article-texte")
+    details = await asyncio.gather(*(fetch_tree(f["url"]) for f in formations[:13]))
+    for f, tree in zip(formations, details):
+        if tree is not None:
+            text_el = tree.css_first(".texte, .article-texte")
             if text_el:
-                text = clean_text(text_el.get_text())
+                text = clean_text(text_el.text())
                 f["description"] = text[:400]
 
-                # Try to extract dates
-                date_match = re.search(r'\d{1,2}\s+(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+\d{4}', text, re.IGNORECASE)
-                if date_match:
-                    f["date"] = date_match.group(0)
-
-                # Try to extract price
-                price_match = re.search(r'(\d+)\s*€', text)
-                if price_match:
-                    f["price"] = price_match.group(0)
-
-                # Duration
-                dur_match = re.search(r'(\d+)\s*jour', text, re.IGNORECASE)
-                if dur_match:
-                    f["duration"] = dur_match.group(0)
+                # First date, price and duration in the text
+                for match in _FORMATION_RE.finditer(text):
+                    if match["date"]:
+                        f.setdefault("date", match["date"] + match["year"])
+                    else:
+                        f.setdefault(match.lastgroup, match.group(0))
+                    if "date" in f and "price" in f and "duration" in f:
+                        break
 
-    save_json(formations, OUTPUT_DIR / "formations" / "all.json")
     return formations
 
 
-def scrape_pratique():
+async def scrape_pratique():
     """Scrape practical resources (modeles de recours, etc.)."""
     print("\n[6/7] Scraping practical resources...")
-    resources = []
-    seen = set()
-
     # Try to find the practical resources section
-    for url in [f"{BASE_URL}/spip.php?rubrique3",
-                f"{BASE_URL}/spip.php?rubrique1",
-                f"{BASE_URL}/spip.php?article136"]:
-        html = fetch(url)
-        if not html:
-            continue
-
-        soup = parse(html)
-
-        for link in soup.select("a"):
-            href = link.get("href", "")
-            title = clean_text(link.get_text())
-            full_url = urljoin(BASE_URL, href)
-
-            if title and len(title) > 5 and full_url not in seen:
-                seen.add(full_url)
-                resources.append({
-                    "url": full_url,
-                    "title": title,
-                })
-
-    save_json(resources, OUTPUT_DIR / "pratique" / "all.json")
-    return resources
+    entry_urls = [f"{BASE_URL}/spip.php?rubrique3",
+                  f"{BASE_URL}/spip.php?rubrique1",
+                  f"{BASE_URL}/spip.php?article136"]
+    return [
+        {"url": url, "title": title}
+        for url, _, title in await harvest(entry_urls, _ALL_LINKS,
+                                           lambda href, title: len(title) > 5)
+    ]
 
 
-def scrape_keywords():
+async def scrape_keywords(articles):
     """Try to extract keywords from scraped articles."""
     print("\n[7/7] Building keywords from scraped content...")
 
-    keywords = {}
-
-    # Read previously scraped articles
-    articles_path = OUTPUT_DIR / "articles" / "all.json"
-    if articles_path.exists():
-        with open(articles_path, encoding="utf-8") as f:
-            articles = json.load(f)
-        for article in articles:
-            for kw in article.get("keywords", []):
-                kw = kw.strip()
-                if kw:
-                    keywords[kw] = keywords.get(kw, 0) + 1
+    keywords = Counter()
+    for article in articles:
+        keywords.update(kw for kw in map(str.strip, article.get("keywords", [])) if kw)
 
     # Also try to scrape the keywords page directly
-    for url in [f"{BASE_URL}/spip.php?page=mots",
-                f"{BASE_URL}/spip.php?rubrique50"]:
-        html = fetch(url)
-        if not html:
+    entry_urls = [f"{BASE_URL}/spip.php?page=mots",
+                  f"{BASE_URL}/spip.php?rubrique50"]
+    for tree in await asyncio.gather(*(fetch_tree(url) for url in entry_urls)):
+        if tree is None:
             continue
 
-        soup = parse(html)
-        for link in soup.select("a[href*='mot'], a[href*='keyword']"):
-            word = clean_text(link.get_text())
+        for link in select(tree, "a[href*='mot'], a[href*='keyword']"):
+            word = clean_text(link.text())
             if word and len(word) > 1 and len(word) < 80:
-                count_el = link.find_next(string=re.compile(r'\(\d+\)'))
+                count_el = find_next_text(link, _COUNT_RE)
                 count = 1
                 if count_el:
-                    match = re.search(r'\((\d+)\)', count_el)
+                    match = _COUNT_RE.search(count_el)
                     if match:
                         count = int(match.group(1))
-                keywords[word] = max(keywords.get(word, 0), count)
+                keywords[word] = max(keywords[word], count)
 
-    save_json(keywords, OUTPUT_DIR / "keywords.json")
     return keywords
 
 
+async def scrape_articles_and_keywords():
+    """Keywords are counted from the articles, so they start as soon as those are in."""
+    articles = await scrape_articles()
+    return articles, await scrape_keywords(articles)
+
+
 # --- Main ---
 
-def main():
+async def main():
+    global session, bucket, in_flight, cache
     print("=" * 60)
     print("GISTI Website Scraper v2")
     print("=" * 60)
     print(f"Base URL: {BASE_URL}")
     print(f"Cache:    {CACHE_DIR}")
     print(f"Output:   {OUTPUT_DIR}")
-    print(f"Rate:     {RATE_LIMIT}s between requests")
+    print(f"Rate:     {RATE_LIMIT}s between requests (bursts of {BURST})")
 
     for subdir in ["articles", "dossiers", "publications", "formations", "pratique"]:
         (OUTPUT_DIR / subdir).mkdir(parents=True, exist_ok=True)
 
-    homepage = scrape_homepage()
-    articles = scrape_articles()
-    dossiers = scrape_dossiers()
-    publications = scrape_publications()
-    formations = scrape_formations()
-    pratique = scrape_pratique()
-    keywords = scrape_keywords()
+    bucket = TokenBucket(rate=1 / RATE_LIMIT, capacity=BURST)
+    in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+    _fetches.clear()
+    _trees.clear()
+    with diskcache.Cache(str(CACHE_DIR), size_limit=CACHE_SIZE_LIMIT,
+                         eviction_policy="least-recently-used") as cache:
+        connector = aiohttp.TCPConnector(limit=MAX_IN_FLIGHT, ttl_dns_cache=300)
+        # aiohttp sends Accept-Encoding itself ("gzip, deflate", plus "br" when the
+        # Brotli package is installed) and decodes the body before text()
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers={"User-Agent": USER_AGENT},
+                                         timeout=aiohttp.ClientTimeout(total=TIMEOUT)) as session:
+            (homepage, (articles, keywords), dossiers, publications,
+             formations, pratique) = await asyncio.gather(
+                scrape_homepage(),
+                scrape_articles_and_keywords(),
+                scrape_dossiers(),
+                scrape_publications(),
+                scrape_formations(),
+                scrape_pratique(),
+            )
+
+    # Everything is written once, after scraping, on worker threads
+    outputs = [
+        (articles, OUTPUT_DIR / "articles" / "all.json"),
+        (dossiers, OUTPUT_DIR / "dossiers" / "all.json"),
+        (publications, OUTPUT_DIR / "publications" / "all.json"),
+        (formations, OUTPUT_DIR / "formations" / "all.json"),
+        (pratique, OUTPUT_DIR / "pratique" / "all.json"),
+        (keywords, OUTPUT_DIR / "keywords.json"),
+    ]
+    if homepage:
+        outputs.insert(0, (homepage, OUTPUT_DIR / "homepage.json"))
+    await asyncio.gather(*(asyncio.to_thread(save_json, data, path) for data, path in outputs))
 
     print("\n" + "=" * 60)
     print("SCRAPING COMPLETE")
@@ -548,4 +677,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())